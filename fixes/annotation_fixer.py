@@ -1,7 +1,17 @@
 """AnnotationFixer that will fix annotations on class methods."""
 from __future__ import annotations
 
-from typing import Dict, List, Optional, Sequence, TypeVar, Union, cast
+from functools import lru_cache
+from typing import (
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    TypeVar,
+    Union,
+    cast,
+)
 
 from libcst import (
     Annotation,
@@ -11,6 +21,7 @@ from libcst import (
     BaseStatement,
     ClassDef,
     Comment,
+    CSTNode,
     CSTTransformer,
     Decorator,
     FlattenSentinel,
@@ -30,10 +41,9 @@ from libcst import (
     parse_expression,
     parse_statement,
 )
-from libcst.metadata import PositionProvider
 
 from fixes.annotation_fixes import (
-    ANNOTATION_FIXES,
+    CUSTOM_TYPES,
     AddAnnotationFix,
     AddImportFix,
     AnnotationFix,
@@ -41,16 +51,44 @@ from fixes.annotation_fixes import (
     FixParameter,
     RemoveFix,
     RemoveOverloadDecoratorFix,
+    fixes_for_module,
+    method_fixes_for_module,
 )
 
 
+@lru_cache(maxsize=None)
+def _parse_annotation(code: str) -> Annotation:
+    """
+    Parse the code of an annotation.
+
+    libcst nodes are immutable, so an Annotation used by several fixes is
+    parsed only once and shared.
+    """
+    return Annotation(annotation=parse_expression(code))
+
+
+@lru_cache(maxsize=None)
+def _type_definitions(mod_name: str) -> Tuple[BaseStatement, ...]:
+    """
+    Return the parsed definitions of the custom types a module's fixes use.
+
+    They only depend on the module, so they are parsed once per module.
+    """
+    return tuple(
+        parse_statement(CUSTOM_TYPES[custom_type])
+        for custom_type in dict.fromkeys(
+            fix.custom_type
+            for fix in fixes_for_module(mod_name)
+            if isinstance(fix, AnnotationFix) and fix.custom_type
+        )
+    )
+
+
 class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
     CSTTransformer
 ):
     """AnnotationFixer that will fix annotations on class methods."""
 
-    METADATA_DEPENDENCIES = (PositionProvider,)
-
     def __init__(
         self,
         mod_name: str,
@@ -66,22 +104,30 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
         self._last_function: List[FunctionDef] = []
 
         # Fixes that will be applied for the current module.
-        self._fixes: List[AnnotationFix | AddAnnotationFix] = [
-            fix for fix in ANNOTATION_FIXES if fix.module_name == mod_name
-        ]
+        self._fixes: List[AnnotationFix | AddAnnotationFix] = list(
+            fixes_for_module(mod_name)
+        )
+
+        # AnnotationFixes by class and method name that are not applied yet.
+        self._method_fixes: Dict[Tuple[str, str], List[AnnotationFix]] = {
+            key: list(fixes)
+            for key, fixes in method_fixes_for_module(mod_name).items()
+        }
 
         # Custom type definitons to be inserted after PYQT_SLOT/PYQT_SIGNAL
-        self._type_defs = set(
-            fix.custom_type
-            for fix in self._fixes
-            if isinstance(fix, AnnotationFix) and fix.custom_type
-        )
+        self._type_defs = _type_definitions(mod_name)
         self._insert_type_defs = False
 
         # Generated fixes (i.e. from mypy)
         self._generated_fixes = [
             fix for fix in fixes if not isinstance(fix, AddImportFix)
         ]
+        # The generated fixes that are not applied yet by their node.
+        self._node_fixes: Dict[
+            CSTNode, List[CommentFix | RemoveFix | RemoveOverloadDecoratorFix]
+        ] = {}
+        for fix in self._generated_fixes:
+            self._node_fixes.setdefault(fix.node, []).append(fix)
         try:
             self._add_import_fix: Optional[AddImportFix] = [
                 fix for fix in fixes if isinstance(fix, AddImportFix)
@@ -95,24 +141,25 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
         # Holds the last method for every class:
         self._last_class_method = last_class_method
 
+        # Rendered code of the annotations checked against fixes:
+        self._annotation_codes: Dict[Annotation, str] = {}
+
         # Holds the fix that will be appended to the currently visited class:
         self._class_comment_fix: CommentFix | None = None
 
     @property
     def class_name(self) -> str | None:
         """Return the name of the current class."""
-        try:
-            return self._last_class[-1].name.value
-        except IndexError:
+        if not self._last_class:
             return None
+        return self._last_class[-1].name.value
 
     @property
     def function_name(self) -> str | None:
         """Return the name of the current function."""
-        try:
-            return self._last_function[-1].name.value
-        except IndexError:
+        if not self._last_function:
             return None
+        return self._last_function[-1].name.value
 
     def visit_ImportFrom(self, node: ImportFrom) -> bool | None:
         if (
@@ -163,9 +210,8 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
         updated_node: SimpleStatementLine,
     ) -> BaseStatement | FlattenSentinel[BaseStatement] | RemovalSentinel:
         if self._insert_type_defs and self._type_defs:
-            type_defs = list(map(parse_statement, self._type_defs))
             self._insert_type_defs = False
-            return FlattenSentinel([updated_node, *type_defs])
+            return FlattenSentinel([updated_node, *self._type_defs])
         return updated_node
 
     def visit_ClassDef(self, node: ClassDef) -> bool:
@@ -174,8 +220,8 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
 
         # Check if any CommentFix must be added to the class. If so, store it
         # in `_class_comment_fix` and apply it in `leave_TrailingWhitespace`
-        for fix in self._generated_fixes:
-            if fix.node == node and isinstance(fix, CommentFix):
+        for fix in self._node_fixes.get(node, []):
+            if isinstance(fix, CommentFix):
                 print(f"Adding '{fix.comment}' to class {node.name.value}")
                 self._class_comment_fix = fix
 
@@ -184,12 +230,11 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
 
     def visit_FunctionDef(self, node: FunctionDef) -> bool:
         self._last_function.append(node)
-        for fix in self._generated_fixes:
-            if any(fix.node == decorator for decorator in node.decorators):
-                print(
-                    f"Visiting function {self.class_name}.{self.function_name} to fix Decorator"
-                )
-                return True
+        if any(decorator in self._node_fixes for decorator in node.decorators):
+            print(
+                f"Visiting function {self.class_name}.{self.function_name} to fix Decorator"
+            )
+            return True
         return False
 
     def visit_Decorator(self, node: "Decorator") -> bool | None:
@@ -207,7 +252,7 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
                 print(
                     f"Removing obsolete decorator on {self.class_name}.{self.function_name}"
                 )
-                self._generated_fixes.remove(mypy_fix)
+                self._remove_generated_fix(mypy_fix)
                 return RemovalSentinel.REMOVE
         return original_node
 
@@ -240,12 +285,14 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
                         cast(Param, star_arg), param, updated_node
                     )
             if function_fix.return_value:
-                expr = parse_expression(function_fix.return_value)
                 updated_node = updated_node.with_changes(
-                    returns=Annotation(expr)
+                    returns=_parse_annotation(function_fix.return_value)
                 )
             # Remove the fix from the class.
             self._fixes.remove(function_fix)
+            self._method_fixes[
+                (function_fix.class_name, function_fix.method_name)
+            ].remove(function_fix)
             self._last_function.pop()
             return updated_node
 
@@ -262,7 +309,7 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
                 )
                 assert original_node == mypy_fix.node
                 return_value = RemovalSentinel.REMOVE
-                self._generated_fixes.remove(mypy_fix)
+                self._remove_generated_fix(mypy_fix)
             else:
                 raise ValueError(f"Got an unknown fix type: {type(mypy_fix)}")
             self._last_function.pop()
@@ -299,10 +346,8 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
             f"{self.function_name}:{original_param.name.value}"
             f" to {param.annotation}"
         )
-        expr = parse_expression(param.annotation)
-        anno = Annotation(annotation=expr)
         updated_node = updated_node.with_deep_changes(
-            original_param, annotation=anno
+            original_param, annotation=_parse_annotation(param.annotation)
         )
         return updated_node
 
@@ -324,7 +369,7 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
             comment = Comment(self._class_comment_fix.comment)
 
             # Remove the fix from `_generated_fixes` and `_class_comment_fix`.
-            self._generated_fixes.remove(self._class_comment_fix)
+            self._remove_generated_fix(self._class_comment_fix)
             self._class_comment_fix = None
 
             # Apply the fix.
@@ -343,41 +388,38 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
 
     def _get_fix(self) -> AnnotationFix | None:
         """Return the AnnotationFix for the current method if available."""
-        for fix in self._fixes:
-            if (
-                isinstance(fix, AnnotationFix)
-                and fix.class_name == self.class_name
-                and fix.method_name == self.function_name
+        if self.class_name is None or self.function_name is None:
+            return None
+        for fix in self._method_fixes.get(
+            (self.class_name, self.function_name), []
+        ):
+            child_count = len(self._last_function[-1].params.children)
+            if (fix.static and child_count != len(fix.params)) or (
+                not fix.static and child_count - 1 != len(fix.params)
             ):
-                child_count = len(self._last_function[-1].params.children)
-                if (fix.static and child_count != len(fix.params)) or (
-                    not fix.static and child_count - 1 != len(fix.params)
-                ):
-                    # If the number of Parameters does not match the number of
-                    # Parameters to fix, we return.
-                    return None
+                # If the number of Parameters does not match the number of
+                # Parameters to fix, we return.
+                return None
 
-                if not self._check_parameters(fix):
-                    continue
+            if not self._check_parameters(fix):
+                continue
 
-                # Check if the function def includes a star parameter and if
-                # it matches one of our fix arguments.
-                star_arg = self._last_function[-1].params.star_arg
-                if (
-                    star_arg
-                    and isinstance(star_arg, Param)
-                    and not any(
-                        fix_param.name == f"*{star_arg.name.value}"
-                        for fix_param in fix.params
-                    )
-                ):
-                    print(
-                        f"Star argument is not matched: *{star_arg.name.value}"
-                    )
-                    return None
+            # Check if the function def includes a star parameter and if
+            # it matches one of our fix arguments.
+            star_arg = self._last_function[-1].params.star_arg
+            if (
+                star_arg
+                and isinstance(star_arg, Param)
+                and not any(
+                    fix_param.name == f"*{star_arg.name.value}"
+                    for fix_param in fix.params
+                )
+            ):
+                print(f"Star argument is not matched: *{star_arg.name.value}")
+                return None
 
-                print(f"Found fix to apply: {fix}")
-                return fix
+            print(f"Found fix to apply: {fix}")
+            return fix
         return None
 
     def _check_parameters(self, fix: AnnotationFix) -> bool:
@@ -387,22 +429,39 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
                 # ignore self params
                 continue
             for fix_param in fix.params:
-                if fix_param.name.startswith("*"):
-                    # Check in parent method against StarArg
+                # Compare the names first, so the annotation is only rendered
+                # for the matching fix parameter. Star parameters never match
+                # here; they are checked against the StarArg by the caller.
+                if fix_param.name != param.name.value:
                     continue
-                same_name = fix_param.name == param.name.value
+                annotation: str | None = None
                 if param.annotation is not None:
-                    code = self._code(param.annotation)
-                    code = code.replace("'", '"')
-                    same_annotation = code == fix_param.current_annotation
-                else:
-                    same_annotation = fix_param.current_annotation is None
-                if same_name and same_annotation:
+                    annotation = self._annotation_code(param.annotation)
+                if annotation == fix_param.current_annotation:
                     break
             else:
                 return False
         return True
 
+    def _annotation_code(self, annotation: Annotation) -> str:
+        """
+        Return the normalized code of an annotation of the visited module.
+
+        Overloads check the same parameters against several fixes, so every
+        annotation is rendered only once.
+        """
+        try:
+            return self._annotation_codes[annotation]
+        except KeyError:
+            code = self._normalized_code(annotation)
+            self._annotation_codes[annotation] = code
+            return code
+
+    @staticmethod
+    def _normalized_code(annotation: Annotation) -> str:
+        """Return the annotation as str, using double quotes only."""
+        return AnnotationFixer._code(annotation).replace("'", '"')
+
     @staticmethod
     def _code(annotation: Annotation) -> str:
         """Return the code as str for the annotation."""
@@ -466,11 +525,19 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
     def _get_mypy_fix(
         self, node: FunctionDef | Decorator
     ) -> CommentFix | RemoveFix | RemoveOverloadDecoratorFix | None:
-        """Return a MypyFix for the given line number if available."""
-        for fix in self._generated_fixes:
-            if fix.node == node:
-                return fix
-        return None
+        """Return a MypyFix for the given node if available."""
+        fixes = self._node_fixes.get(node)
+        return fixes[0] if fixes else None
+
+    def _remove_generated_fix(
+        self, fix: CommentFix | RemoveFix | RemoveOverloadDecoratorFix
+    ) -> None:
+        """Remove a generated fix after it was applied."""
+        self._generated_fixes.remove(fix)
+        node_fixes = self._node_fixes[fix.node]
+        node_fixes.remove(fix)
+        if not node_fixes:
+            del self._node_fixes[fix.node]
 
     NodeT = TypeVar("NodeT", FunctionDef, Decorator)
 
@@ -490,6 +557,6 @@ class AnnotationFixer(  # pylint: disable=too-many-instance-attributes
             updated_node = updated_node.with_deep_changes(
                 change_node, comment=comment
             )
-            self._generated_fixes.remove(fix)
+            self._remove_generated_fix(fix)
             return updated_node
         raise ValueError(f"Don't know what to do with {fix}")
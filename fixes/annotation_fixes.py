@@ -1,13 +1,27 @@
 """Definition of all annotation fixes."""
 
+import importlib
+import sys
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from functools import lru_cache
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple, Union
 
 from libcst import ClassDef, Decorator, FunctionDef
 
+from fixes.annotation_fixes_data import (
+    QT_MODULES,
+    FixRow,
+    OverloadedFixRow,
+    ParamRow,
+)
 
-@dataclass
-class FixParameter:
+# Definitions of the custom types that AnnotationFixes can add to a module.
+CUSTOM_TYPES: Dict[str, str] = {
+    "QObjectT": 'QObjectT = typing.TypeVar("QObjectT", bound=QObject)',
+}
+
+
+class FixParameter(NamedTuple):
     """Defines a single Parameter for a fix in AnnotationFix."""
 
     name: str  # name of the parameter
@@ -17,580 +31,169 @@ class FixParameter:
     # todo: return values!
 
 
-@dataclass
-class AnnotationFix:
+class AnnotationFix(NamedTuple):
     """Defines a Fix for an annotation of function parameter."""
 
     module_name: str  # name of the module in which the fix will be applied
     class_name: str  # name of the class the method belongs to
     method_name: str  # name of the method
-    params: List[FixParameter]  # List of the method's parameters
+    params: Tuple[FixParameter, ...]  # the method's parameters
     return_value: Optional[str] = None
     custom_type: Optional[
         str
-    ] = None  # Defines a custom type that will be added once to the module
+    ] = None  # Name of a CUSTOM_TYPES type that will be added to the module
     static: bool = False  # Is the method static?
 
+    @property
+    def has_changes(self) -> bool:
+        """Return if applying the fix changes the method at all."""
+        return self.return_value is not None or any(
+            param.annotation != param.current_annotation
+            for param in self.params
+        )
 
-@dataclass
+
+@dataclass(eq=False)
 class CommentFix:
     """Fixes a FunctionDef or a Decorator by appending a comment to it."""
 
+    __slots__ = ("node", "comment")
+
     node: Union[ClassDef, FunctionDef, Decorator]
     comment: str
 
 
-@dataclass
+@dataclass(eq=False)
 class RemoveFix:
     """Remove a node because mypy detected it as obsolete."""
 
+    __slots__ = ("node",)
+
     node: Union[FunctionDef, Decorator]
 
 
-@dataclass
+@dataclass(eq=False)
 class RemoveOverloadDecoratorFix:
     """Remove an overload Decorator because the method is the last method left."""
 
+    __slots__ = ("node",)
+
     node: Decorator
 
 
-@dataclass
+@dataclass(eq=False)
 class AddImportFix:
     """Add missing imports to PyQt6 imports."""
 
+    __slots__ = ("missing_imports",)
+
     missing_imports: List[str]
 
 
-@dataclass
-class AddAnnotationFix:
+class AddAnnotationFix(NamedTuple):
     """Adds annotations to a class."""
 
     module_name: str  # name of the module in which the fix will be applied
     class_name: str  # name of the class the method belongs to
-    annotations: List[str]  # annotations to be added.
-
-
-# Fix definitions
-ANNOTATION_FIXES: List[Union[AnnotationFix, AddAnnotationFix]] = [
-    AnnotationFix(
-        "QtWidgets",
-        "QLineEdit",
-        "setText",
-        [FixParameter("a0", "typing.Optional[str]", "str")],
-    ),
-    AnnotationFix(
-        "sip",
-        "voidptr",
-        "setwriteable",
-        [FixParameter("bool", "bool", None)],
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QObject",
-        "findChildren",
-        [
-            FixParameter(
-                "type",
-                "typing.Type[QObjectT]",
-                "type",
-            ),
-            FixParameter("name", "str", "str"),
-            FixParameter(
-                "options", "Qt.FindChildOption", "Qt.FindChildOption"
-            ),
-        ],
-        'typing.List["QObjectT"]',
-        'QObjectT = typing.TypeVar("QObjectT", bound=QObject)',
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QObject",
-        "findChildren",
-        [
-            FixParameter(
-                "types",
-                "typing.Tuple[typing.Type[QObjectT], ...]",
-                "typing.Tuple",
-            ),
-            FixParameter("name", "str", "str"),
-            FixParameter(
-                "options", "Qt.FindChildOption", "Qt.FindChildOption"
-            ),
-        ],
-        'typing.List["QObjectT"]',
-        'QObjectT = typing.TypeVar("QObjectT", bound=QObject)',
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QObject",
-        "findChildren",
-        [
-            FixParameter(
-                "type",
-                "typing.Type[QObjectT]",
-                "type",
-            ),
-            FixParameter("re", '"QRegularExpression"', '"QRegularExpression"'),
-            FixParameter(
-                "options", "Qt.FindChildOption", "Qt.FindChildOption"
-            ),
-        ],
-        'typing.List["QObjectT"]',
-        'QObjectT = typing.TypeVar("QObjectT", bound=QObject)',
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QObject",
-        "findChildren",
-        [
-            FixParameter(
-                "types",
-                "typing.Tuple[typing.Type[QObjectT], ...]",
-                "typing.Tuple",
-            ),
-            FixParameter("re", '"QRegularExpression"', '"QRegularExpression"'),
-            FixParameter(
-                "options", "Qt.FindChildOption", "Qt.FindChildOption"
-            ),
-        ],
-        'typing.List["QObjectT"]',
-        'QObjectT = typing.TypeVar("QObjectT", bound=QObject)',
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QObject",
-        "findChild",
-        [
-            FixParameter(
-                "type",
-                "typing.Type[QObjectT]",
-                "type",
-            ),
-            FixParameter("name", "str", "str"),
-            FixParameter(
-                "options", "Qt.FindChildOption", "Qt.FindChildOption"
-            ),
-        ],
-        '"QObjectT"',
-        'QObjectT = typing.TypeVar("QObjectT", bound=QObject)',
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QObject",
-        "findChild",
-        [
-            FixParameter(
-                "types",
-                "typing.Tuple[typing.Type[QObjectT], ...]",
-                "typing.Tuple",
-            ),
-            FixParameter("name", "str", "str"),
-            FixParameter(
-                "options", "Qt.FindChildOption", "Qt.FindChildOption"
-            ),
-        ],
-        '"QObjectT"',
-        'QObjectT = typing.TypeVar("QObjectT", bound=QObject)',
-    ),
-    AnnotationFix(
-        "QtDBus",
-        "QDBusAbstractInterface",
-        "asyncCall",
-        [
-            FixParameter("method", "str", "str"),
-            FixParameter("*a1", "typing.Any", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtDBus",
-        "QDBusAbstractInterface",
-        "call",
-        [
-            FixParameter("method", "str", "str"),
-            FixParameter("*a1", "typing.Any", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtDBus",
-        "QDBusAbstractInterface",
-        "call",
-        [
-            FixParameter("mode", '"QDBus.CallMode"', '"QDBus.CallMode"'),
-            FixParameter("method", "str", "str"),
-            FixParameter("*a2", "typing.Any", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QAbstractItemView",
-        "setModel",
-        [
-            FixParameter(
-                "model",
-                "typing.Optional[QtCore.QAbstractItemModel]",
-                "QtCore.QAbstractItemModel",
-            ),
-        ],
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QColumnView",
-        "setModel",
-        [
-            FixParameter(
-                "model",
-                "typing.Optional[QtCore.QAbstractItemModel]",
-                "QtCore.QAbstractItemModel",
-            ),
-        ],
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QHeaderView",
-        "setModel",
-        [
-            FixParameter(
-                "model",
-                "typing.Optional[QtCore.QAbstractItemModel]",
-                "QtCore.QAbstractItemModel",
-            ),
-        ],
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QTableView",
-        "setModel",
-        [
-            FixParameter(
-                "model",
-                "typing.Optional[QtCore.QAbstractItemModel]",
-                "QtCore.QAbstractItemModel",
-            ),
-        ],
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QTreeView",
-        "setModel",
-        [
-            FixParameter(
-                "model",
-                "typing.Optional[QtCore.QAbstractItemModel]",
-                "QtCore.QAbstractItemModel",
-            ),
-        ],
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QMessageBox",
-        "aboutQt",
-        [
-            FixParameter(
-                "parent",
-                "typing.Optional[QWidget]",
-                "QWidget",
-            ),
-            FixParameter("title", "str", "str"),
-        ],
-        static=True,
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QMessageBox",
-        "about",
-        [
-            FixParameter(
-                "parent",
-                "typing.Optional[QWidget]",
-                "QWidget",
-            ),
-            FixParameter("caption", "str", "str"),
-            FixParameter("text", "str", "str"),
-        ],
-        static=True,
-    ),
-    AnnotationFix(
-        "QtWidgets",
-        "QProgressDialog",
-        "setCancelButton",
-        [
-            FixParameter(
-                "button",
-                "typing.Optional[QPushButton]",
-                "QPushButton",
-            ),
-        ],
-    ),
-    AddAnnotationFix(
-        "QtWidgets",
-        "QTreeWidgetItem",
-        ['def __lt__(self, other: "QTreeWidgetItem") -> bool: ...'],
-    ),
-    AddAnnotationFix(
-        "QtWidgets",
-        "QTableWidgetItem",
-        [
-            "def __eq__(self, other: object) -> bool: ...",
-            "def __ge__(self, other: object) -> bool: ...",
-            "def __gt__(self, other: object) -> bool: ...",
-            "def __le__(self, other: object) -> bool: ...",
-            "def __lt__(self, other: object) -> bool: ...",
-            "def __ne__(self, other: object) -> bool: ...",
-        ],
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QCoreApplication",
-        "instance",
-        [],
-        'typing.Optional["QCoreApplication"]',
-        static=True,
-    ),
-    AddAnnotationFix(
-        "QtCore",
-        "QCoreApplication",
-        [
-            "applicationNameChanged: typing.ClassVar[pyqtSignal]",
-            "applicationVersionChanged: typing.ClassVar[pyqtSignal]",
-            "organizationDomainChanged: typing.ClassVar[pyqtSignal]",
-            "organizationNameChanged: typing.ClassVar[pyqtSignal]",
-        ],
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QJsonDocument",
-        "__init__",
-        [
-            FixParameter(
-                "array",
-                'typing.Iterable[typing.Union["QJsonValue", "QJsonValue.Type", typing.Dict[str, "QJsonValue"], bool, int, float, str]]',
-                'typing.Iterable["QJsonValue"]',
-            ),
-        ],
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QJsonDocument",
-        "setArray",
-        [
-            FixParameter(
-                "array",
-                'typing.Iterable[typing.Union["QJsonValue", "QJsonValue.Type", typing.Dict[str, "QJsonValue"], bool, int, float, str]]',
-                'typing.Iterable["QJsonValue"]',
-            ),
-        ],
-    ),
-    AnnotationFix(
-        "QtCore",
-        "QJsonValue",
-        "toArray",
-        [
-            FixParameter(
-                "defaultValue",
-                'typing.Iterable[typing.Union["QJsonValue", "QJsonValue.Type", typing.Dict[str, "QJsonValue"], bool, int, float, str]]',
-                'typing.Iterable["QJsonValue"]',
-            ),
-        ],
-    ),
-    AddAnnotationFix(
-        "QtCore",
-        "QPoint",
-        [
-            'def __add__(self, point: "QPoint") -> "QPoint": ...',
-            'def __sub__(self, point: "QPoint") -> "QPoint": ...',
-            'def __mul__(self, factor: float) -> "QPoint": ...',
-            'def __truediv__(self, divisor: float) -> "QPoint": ...',
-        ],
-    ),
-    AddAnnotationFix(
-        "QtCore",
-        "QPointF",
-        [
-            'def __add__(self, point: "QPointF") -> "QPointF": ...',
-            'def __sub__(self, point: "QPointF") -> "QPointF": ...',
-            'def __mul__(self, factor: float) -> "QPointF": ...',
-            'def __truediv__(self, divisor: float) -> "QPointF": ...',
-        ],
-    ),
-    AddAnnotationFix(
-        "QtCore",
-        "QSize",
-        [
-            "def __eq__(self, value: object) -> bool: ...",
-            "def __ne__(self, value: object) -> bool: ...",
-            'def __add__(self, value: "QSize") -> "QSize": ...',
-            'def __iadd__(self, value: "QSize") -> "QSize": ...',
-            'def __sub__(self, value: "QSize") -> "QSize": ...',
-            'def __isub__(self, value: "QSize") -> "QSize": ...',
-            'def __mul__(self, value: float) -> "QSize": ...',
-            'def __rmul__(self, value: float) -> "QSize": ...',
-            'def __imul__(self, value: float) -> "QSize": ...',
-            'def __truediv__(self, value: float) -> "QSize": ...',
-            'def __itruediv__(self, value: float) -> "QSize": ...',
-        ],
-    ),
-    AddAnnotationFix(
-        "QtCore",
-        "QSizeF",
-        [
-            "def __eq__(self, value: object) -> bool: ...",
-            "def __ne__(self, value: object) -> bool: ...",
-            'def __add__(self, value: "QSizeF") -> "QSizeF": ...',
-            'def __iadd__(self, value: "QSizeF") -> "QSizeF": ...',
-            'def __sub__(self, value: "QSizeF") -> "QSizeF": ...',
-            'def __isub__(self, value: "QSizeF") -> "QSizeF": ...',
-            'def __mul__(self, value: float) -> "QSizeF": ...',
-            'def __rmul__(self, value: float) -> "QSizeF": ...',
-            'def __imul__(self, value: float) -> "QSizeF": ...',
-            'def __truediv__(self, value: float) -> "QSizeF": ...',
-            'def __itruediv__(self, value: float) -> "QSizeF": ...',
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawConvexPolygon",
-        [
-            FixParameter("point", "QtCore.QPointF", "QtCore.QPointF"),
-            FixParameter("*a1", "QtCore.QPointF", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawConvexPolygon",
-        [
-            FixParameter("point", "QtCore.QPoint", "QtCore.QPoint"),
-            FixParameter("*a1", "QtCore.QPoint", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawPolygon",
-        [
-            FixParameter("point", "QtCore.QPointF", "QtCore.QPointF"),
-            FixParameter("*a1", "QtCore.QPointF", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawPolygon",
-        [
-            FixParameter("point", "QtCore.QPoint", "QtCore.QPoint"),
-            FixParameter("*a1", "QtCore.QPoint", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawPolyline",
-        [
-            FixParameter("point", "QtCore.QPointF", "QtCore.QPointF"),
-            FixParameter("*a1", "QtCore.QPointF", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawPolyline",
-        [
-            FixParameter("point", "QtCore.QPoint", "QtCore.QPoint"),
-            FixParameter("*a1", "QtCore.QPoint", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawRects",
-        [
-            FixParameter("rect", "QtCore.QRectF", "QtCore.QRectF"),
-            FixParameter("*a1", "QtCore.QRectF", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawRects",
-        [
-            FixParameter("rect", "QtCore.QRect", "QtCore.QRect"),
-            FixParameter("*a1", "QtCore.QRect", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawLines",
-        [
-            FixParameter("line", "QtCore.QLineF", "QtCore.QLineF"),
-            FixParameter("*a1", "QtCore.QLineF", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawLines",
-        [
-            FixParameter("line", "QtCore.QLine", "QtCore.QLine"),
-            FixParameter("*a1", "QtCore.QLine", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawLines",
-        [
-            FixParameter("pointPair", "QtCore.QPointF", "QtCore.QPointF"),
-            FixParameter("*a1", "QtCore.QPointF", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawLines",
-        [
-            FixParameter("pointPair", "QtCore.QPoint", "QtCore.QPoint"),
-            FixParameter("*a1", "QtCore.QPoint", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawPoints",
-        [
-            FixParameter("point", "QtCore.QPointF", "QtCore.QPointF"),
-            FixParameter("*a1", "QtCore.QPointF", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPainter",
-        "drawPoints",
-        [
-            FixParameter("point", "QtCore.QPoint", "QtCore.QPoint"),
-            FixParameter("*a1", "QtCore.QPoint", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPolygon",
-        "putPoints",
-        [
-            FixParameter("index", "int", "int"),
-            FixParameter("firstx", "int", "int"),
-            FixParameter("firsty", "int", "int"),
-            FixParameter("*a3", "int", None),
-        ],
-    ),
-    AnnotationFix(
-        "QtGui",
-        "QPolygon",
-        "setPoints",
-        [
-            FixParameter("firstx", "int", "int"),
-            FixParameter("firsty", "int", "int"),
-            FixParameter("*a2", "int", None),
-        ],
-    ),
-]
+    annotations: Tuple[str, ...]  # annotations to be added.
+
+
+def _interned(row: Tuple[Any, ...]) -> Tuple[Any, ...]:
+    """Return the row with all its strings interned."""
+    return tuple(
+        sys.intern(value) if isinstance(value, str) else value for value in row
+    )
+
+
+@lru_cache(maxsize=None)
+def _fix_parameter(row: ParamRow) -> FixParameter:
+    """
+    Create a FixParameter from a ParamRow.
+
+    Equal rows share one FixParameter, across all modules.
+    """
+    return FixParameter(*_interned(row))
+
+
+def _annotation_fix(
+    module_name: str,
+    row: Union[FixRow, OverloadedFixRow],
+    params: Tuple[ParamRow, ...],
+) -> AnnotationFix:
+    """Create an AnnotationFix from a data row and its parameter rows."""
+    return AnnotationFix(
+        module_name,
+        sys.intern(row.class_name),
+        sys.intern(row.method_name),
+        tuple(map(_fix_parameter, params)),
+        row.return_value,
+        row.custom_type,
+        row.static,
+    )
+
+
+def _build_fixes(
+    module_name: str,
+) -> Tuple[Union[AnnotationFix, AddAnnotationFix], ...]:
+    """
+    Build the fixes of one Qt module from its data rows.
+
+    The data module is imported on demand, modules without one have no fixes.
+    The rows leave out the module name, every fix gets the given one.
+    AnnotationFixes that would not change anything are left out.
+    """
+    if module_name not in QT_MODULES:
+        return ()
+    data = importlib.import_module(
+        f"fixes.annotation_fixes_data.{module_name.lower()}"
+    )
+    fixes: List[Union[AnnotationFix, AddAnnotationFix]] = [
+        *(
+            _annotation_fix(module_name, row, row.params)
+            for row in data.ANNOTATION_FIX_DATA
+        ),
+        *(
+            _annotation_fix(module_name, row, params)
+            for row in data.OVERLOADED_FIX_DATA
+            for params in row.overloads
+        ),
+        *(
+            AddAnnotationFix(module_name, row.class_name, row.annotations)
+            for row in data.ADD_ANNOTATION_FIX_DATA
+        ),
+    ]
+    return tuple(
+        fix
+        for fix in fixes
+        if not isinstance(fix, AnnotationFix) or fix.has_changes
+    )
+
+
+@lru_cache(maxsize=None)
+def fixes_for_module(
+    module_name: str,
+) -> Tuple[Union[AnnotationFix, AddAnnotationFix], ...]:
+    """
+    Return the fixes for the given Qt module.
+
+    The fixes of a module are built once on first request.
+    """
+    return _build_fixes(module_name)
+
+
+@lru_cache(maxsize=None)
+def method_fixes_for_module(
+    module_name: str,
+) -> Dict[Tuple[str, str], Tuple[AnnotationFix, ...]]:
+    """
+    Return the AnnotationFixes of the given Qt module by class and method.
+
+    The index is built once per module. The fixes of overloaded methods keep
+    their order.
+    """
+    index: Dict[Tuple[str, str], List[AnnotationFix]] = {}
+    for fix in fixes_for_module(module_name):
+        if isinstance(fix, AnnotationFix):
+            key = (fix.class_name, fix.method_name)
+            index.setdefault(key, []).append(fix)
+    return {key: tuple(fixes) for key, fixes in index.items()}
@@ -0,0 +1,48 @@
+"""
+Data rows of all annotation fixes, one submodule per Qt module.
+
+The submodule of a Qt module is named after the lowercased module name and
+only imported when fixes for that module are requested.
+"""
+
+from typing import Final, NamedTuple, Optional, Tuple
+
+# Qt modules that have a submodule with fixes.
+QT_MODULES: Final = ("QtCore", "QtDBus", "QtGui", "QtWidgets", "sip")
+
+
+class ParamRow(NamedTuple):
+    """Row of a parameter of a method fix."""
+
+    name: str  # name of the parameter
+    annotation: str  # desired annotation as str
+    current_annotation: Optional[str]  # current annotation as str
+
+
+class FixRow(NamedTuple):
+    """Row of a fix for a method."""
+
+    class_name: str  # name of the class the method belongs to
+    method_name: str  # name of the method
+    params: Tuple[ParamRow, ...]  # the method's parameters
+    return_value: Optional[str] = None
+    custom_type: Optional[str] = None  # Name of a CUSTOM_TYPES type
+    static: bool = False  # Is the method static?
+
+
+class OverloadedFixRow(NamedTuple):
+    """Row of the fixes for an overloaded method, one per overload."""
+
+    class_name: str  # name of the class the method belongs to
+    method_name: str  # name of the method
+    overloads: Tuple[Tuple[ParamRow, ...], ...]  # parameters per overload
+    return_value: Optional[str] = None
+    custom_type: Optional[str] = None  # Name of a CUSTOM_TYPES type
+    static: bool = False  # Is the method static?
+
+
+class AddAnnotationRow(NamedTuple):
+    """Row of annotations to add to a class."""
+
+    class_name: str  # name of the class
+    annotations: Tuple[str, ...]  # annotations to be added
@@ -0,0 +1,154 @@
+"""Data rows of the annotation fixes for QtCore."""
+from typing import Final, Tuple
+
+from fixes.annotation_fixes_data import (
+    AddAnnotationRow,
+    FixRow,
+    OverloadedFixRow,
+    ParamRow,
+)
+
+# Annotation strings shared by several fixes.
+_TYPE_QOBJECT_T: Final = "typing.Type[QObjectT]"
+_TUPLE_TYPE_QOBJECT_T: Final = "typing.Tuple[typing.Type[QObjectT], ...]"
+_LIST_QOBJECT_T: Final = 'typing.List["QObjectT"]'
+_FIND_CHILD_OPTION: Final = "Qt.FindChildOption"
+_QREGULAREXPRESSION: Final = '"QRegularExpression"'
+_JSON_ARRAY: Final = 'typing.Iterable[typing.Union["QJsonValue", "QJsonValue.Type", typing.Dict[str, "QJsonValue"], bool, int, float, str]]'
+_JSON_ARRAY_ORIG: Final = 'typing.Iterable["QJsonValue"]'
+
+ANNOTATION_FIX_DATA: Final[Tuple[FixRow, ...]] = (
+    FixRow(
+        "QCoreApplication",
+        "instance",
+        (),
+        return_value='typing.Optional["QCoreApplication"]',
+        static=True,
+    ),
+    FixRow(
+        "QJsonDocument",
+        "__init__",
+        (ParamRow("array", _JSON_ARRAY, _JSON_ARRAY_ORIG),),
+    ),
+    FixRow(
+        "QJsonDocument",
+        "setArray",
+        (ParamRow("array", _JSON_ARRAY, _JSON_ARRAY_ORIG),),
+    ),
+    FixRow(
+        "QJsonValue",
+        "toArray",
+        (ParamRow("defaultValue", _JSON_ARRAY, _JSON_ARRAY_ORIG),),
+    ),
+)
+
+OVERLOADED_FIX_DATA: Final[Tuple[OverloadedFixRow, ...]] = (
+    OverloadedFixRow(
+        "QObject",
+        "findChildren",
+        (
+            (
+                ParamRow("type", _TYPE_QOBJECT_T, "type"),
+                ParamRow("name", "str", "str"),
+                ParamRow("options", _FIND_CHILD_OPTION, _FIND_CHILD_OPTION),
+            ),
+            (
+                ParamRow("types", _TUPLE_TYPE_QOBJECT_T, "typing.Tuple"),
+                ParamRow("name", "str", "str"),
+                ParamRow("options", _FIND_CHILD_OPTION, _FIND_CHILD_OPTION),
+            ),
+            (
+                ParamRow("type", _TYPE_QOBJECT_T, "type"),
+                ParamRow("re", _QREGULAREXPRESSION, _QREGULAREXPRESSION),
+                ParamRow("options", _FIND_CHILD_OPTION, _FIND_CHILD_OPTION),
+            ),
+            (
+                ParamRow("types", _TUPLE_TYPE_QOBJECT_T, "typing.Tuple"),
+                ParamRow("re", _QREGULAREXPRESSION, _QREGULAREXPRESSION),
+                ParamRow("options", _FIND_CHILD_OPTION, _FIND_CHILD_OPTION),
+            ),
+        ),
+        return_value=_LIST_QOBJECT_T,
+        custom_type="QObjectT",
+    ),
+    OverloadedFixRow(
+        "QObject",
+        "findChild",
+        (
+            (
+                ParamRow("type", _TYPE_QOBJECT_T, "type"),
+                ParamRow("name", "str", "str"),
+                ParamRow("options", _FIND_CHILD_OPTION, _FIND_CHILD_OPTION),
+            ),
+            (
+                ParamRow("types", _TUPLE_TYPE_QOBJECT_T, "typing.Tuple"),
+                ParamRow("name", "str", "str"),
+                ParamRow("options", _FIND_CHILD_OPTION, _FIND_CHILD_OPTION),
+            ),
+        ),
+        return_value='"QObjectT"',
+        custom_type="QObjectT",
+    ),
+)
+
+ADD_ANNOTATION_FIX_DATA: Final[Tuple[AddAnnotationRow, ...]] = (
+    AddAnnotationRow(
+        "QCoreApplication",
+        (
+            "applicationNameChanged: typing.ClassVar[pyqtSignal]",
+            "applicationVersionChanged: typing.ClassVar[pyqtSignal]",
+            "organizationDomainChanged: typing.ClassVar[pyqtSignal]",
+            "organizationNameChanged: typing.ClassVar[pyqtSignal]",
+        ),
+    ),
+    AddAnnotationRow(
+        "QPoint",
+        (
+            'def __add__(self, point: "QPoint") -> "QPoint": ...',
+            'def __sub__(self, point: "QPoint") -> "QPoint": ...',
+            'def __mul__(self, factor: float) -> "QPoint": ...',
+            'def __truediv__(self, divisor: float) -> "QPoint": ...',
+        ),
+    ),
+    AddAnnotationRow(
+        "QPointF",
+        (
+            'def __add__(self, point: "QPointF") -> "QPointF": ...',
+            'def __sub__(self, point: "QPointF") -> "QPointF": ...',
+            'def __mul__(self, factor: float) -> "QPointF": ...',
+            'def __truediv__(self, divisor: float) -> "QPointF": ...',
+        ),
+    ),
+    AddAnnotationRow(
+        "QSize",
+        (
+            "def __eq__(self, value: object) -> bool: ...",
+            "def __ne__(self, value: object) -> bool: ...",
+            'def __add__(self, value: "QSize") -> "QSize": ...',
+            'def __iadd__(self, value: "QSize") -> "QSize": ...',
+            'def __sub__(self, value: "QSize") -> "QSize": ...',
+            'def __isub__(self, value: "QSize") -> "QSize": ...',
+            'def __mul__(self, value: float) -> "QSize": ...',
+            'def __rmul__(self, value: float) -> "QSize": ...',
+            'def __imul__(self, value: float) -> "QSize": ...',
+            'def __truediv__(self, value: float) -> "QSize": ...',
+            'def __itruediv__(self, value: float) -> "QSize": ...',
+        ),
+    ),
+    AddAnnotationRow(
+        "QSizeF",
+        (
+            "def __eq__(self, value: object) -> bool: ...",
+            "def __ne__(self, value: object) -> bool: ...",
+            'def __add__(self, value: "QSizeF") -> "QSizeF": ...',
+            'def __iadd__(self, value: "QSizeF") -> "QSizeF": ...',
+            'def __sub__(self, value: "QSizeF") -> "QSizeF": ...',
+            'def __isub__(self, value: "QSizeF") -> "QSizeF": ...',
+            'def __mul__(self, value: float) -> "QSizeF": ...',
+            'def __rmul__(self, value: float) -> "QSizeF": ...',
+            'def __imul__(self, value: float) -> "QSizeF": ...',
+            'def __truediv__(self, value: float) -> "QSizeF": ...',
+            'def __itruediv__(self, value: float) -> "QSizeF": ...',
+        ),
+    ),
+)
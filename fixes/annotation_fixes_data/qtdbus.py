@@ -0,0 +1,40 @@
+"""Data rows of the annotation fixes for QtDBus."""
+from typing import Final, Tuple
+
+from fixes.annotation_fixes_data import (
+    AddAnnotationRow,
+    FixRow,
+    OverloadedFixRow,
+    ParamRow,
+)
+
+ANNOTATION_FIX_DATA: Final[Tuple[FixRow, ...]] = (
+    FixRow(
+        "QDBusAbstractInterface",
+        "asyncCall",
+        (
+            ParamRow("method", "str", "str"),
+            ParamRow("*a1", "typing.Any", None),
+        ),
+    ),
+)
+
+OVERLOADED_FIX_DATA: Final[Tuple[OverloadedFixRow, ...]] = (
+    OverloadedFixRow(
+        "QDBusAbstractInterface",
+        "call",
+        (
+            (
+                ParamRow("method", "str", "str"),
+                ParamRow("*a1", "typing.Any", None),
+            ),
+            (
+                ParamRow("mode", '"QDBus.CallMode"', '"QDBus.CallMode"'),
+                ParamRow("method", "str", "str"),
+                ParamRow("*a2", "typing.Any", None),
+            ),
+        ),
+    ),
+)
+
+ADD_ANNOTATION_FIX_DATA: Final[Tuple[AddAnnotationRow, ...]] = ()
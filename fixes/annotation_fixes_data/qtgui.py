@@ -0,0 +1,131 @@
+"""Data rows of the annotation fixes for QtGui."""
+from typing import Final, Tuple
+
+from fixes.annotation_fixes_data import (
+    AddAnnotationRow,
+    FixRow,
+    OverloadedFixRow,
+    ParamRow,
+)
+
+ANNOTATION_FIX_DATA: Final[Tuple[FixRow, ...]] = (
+    FixRow(
+        "QPolygon",
+        "putPoints",
+        (
+            ParamRow("index", "int", "int"),
+            ParamRow("firstx", "int", "int"),
+            ParamRow("firsty", "int", "int"),
+            ParamRow("*a3", "int", None),
+        ),
+    ),
+    FixRow(
+        "QPolygon",
+        "setPoints",
+        (
+            ParamRow("firstx", "int", "int"),
+            ParamRow("firsty", "int", "int"),
+            ParamRow("*a2", "int", None),
+        ),
+    ),
+)
+
+# QPainter methods taking a first item and more items of the same type. Each
+# has an overload for the floating point and for the integer variant of the
+# type.
+OVERLOADED_FIX_DATA: Final[Tuple[OverloadedFixRow, ...]] = (
+    OverloadedFixRow(
+        "QPainter",
+        "drawConvexPolygon",
+        (
+            (
+                ParamRow("point", "QtCore.QPointF", "QtCore.QPointF"),
+                ParamRow("*a1", "QtCore.QPointF", None),
+            ),
+            (
+                ParamRow("point", "QtCore.QPoint", "QtCore.QPoint"),
+                ParamRow("*a1", "QtCore.QPoint", None),
+            ),
+        ),
+    ),
+    OverloadedFixRow(
+        "QPainter",
+        "drawPolygon",
+        (
+            (
+                ParamRow("point", "QtCore.QPointF", "QtCore.QPointF"),
+                ParamRow("*a1", "QtCore.QPointF", None),
+            ),
+            (
+                ParamRow("point", "QtCore.QPoint", "QtCore.QPoint"),
+                ParamRow("*a1", "QtCore.QPoint", None),
+            ),
+        ),
+    ),
+    OverloadedFixRow(
+        "QPainter",
+        "drawPolyline",
+        (
+            (
+                ParamRow("point", "QtCore.QPointF", "QtCore.QPointF"),
+                ParamRow("*a1", "QtCore.QPointF", None),
+            ),
+            (
+                ParamRow("point", "QtCore.QPoint", "QtCore.QPoint"),
+                ParamRow("*a1", "QtCore.QPoint", None),
+            ),
+        ),
+    ),
+    OverloadedFixRow(
+        "QPainter",
+        "drawRects",
+        (
+            (
+                ParamRow("rect", "QtCore.QRectF", "QtCore.QRectF"),
+                ParamRow("*a1", "QtCore.QRectF", None),
+            ),
+            (
+                ParamRow("rect", "QtCore.QRect", "QtCore.QRect"),
+                ParamRow("*a1", "QtCore.QRect", None),
+            ),
+        ),
+    ),
+    OverloadedFixRow(
+        "QPainter",
+        "drawLines",
+        (
+            (
+                ParamRow("line", "QtCore.QLineF", "QtCore.QLineF"),
+                ParamRow("*a1", "QtCore.QLineF", None),
+            ),
+            (
+                ParamRow("line", "QtCore.QLine", "QtCore.QLine"),
+                ParamRow("*a1", "QtCore.QLine", None),
+            ),
+            (
+                ParamRow("pointPair", "QtCore.QPointF", "QtCore.QPointF"),
+                ParamRow("*a1", "QtCore.QPointF", None),
+            ),
+            (
+                ParamRow("pointPair", "QtCore.QPoint", "QtCore.QPoint"),
+                ParamRow("*a1", "QtCore.QPoint", None),
+            ),
+        ),
+    ),
+    OverloadedFixRow(
+        "QPainter",
+        "drawPoints",
+        (
+            (
+                ParamRow("point", "QtCore.QPointF", "QtCore.QPointF"),
+                ParamRow("*a1", "QtCore.QPointF", None),
+            ),
+            (
+                ParamRow("point", "QtCore.QPoint", "QtCore.QPoint"),
+                ParamRow("*a1", "QtCore.QPoint", None),
+            ),
+        ),
+    ),
+)
+
+ADD_ANNOTATION_FIX_DATA: Final[Tuple[AddAnnotationRow, ...]] = ()
@@ -0,0 +1,91 @@
+"""Data rows of the annotation fixes for QtWidgets."""
+from typing import Final, Tuple
+
+from fixes.annotation_fixes_data import (
+    AddAnnotationRow,
+    FixRow,
+    OverloadedFixRow,
+    ParamRow,
+)
+
+# Annotation strings shared by several fixes.
+_OPT_ITEM_MODEL: Final = "typing.Optional[QtCore.QAbstractItemModel]"
+_ITEM_MODEL: Final = "QtCore.QAbstractItemModel"
+_OPT_QWIDGET: Final = "typing.Optional[QWidget]"
+
+ANNOTATION_FIX_DATA: Final[Tuple[FixRow, ...]] = (
+    FixRow(
+        "QLineEdit",
+        "setText",
+        (ParamRow("a0", "typing.Optional[str]", "str"),),
+    ),
+    FixRow(
+        "QAbstractItemView",
+        "setModel",
+        (ParamRow("model", _OPT_ITEM_MODEL, _ITEM_MODEL),),
+    ),
+    FixRow(
+        "QColumnView",
+        "setModel",
+        (ParamRow("model", _OPT_ITEM_MODEL, _ITEM_MODEL),),
+    ),
+    FixRow(
+        "QHeaderView",
+        "setModel",
+        (ParamRow("model", _OPT_ITEM_MODEL, _ITEM_MODEL),),
+    ),
+    FixRow(
+        "QTableView",
+        "setModel",
+        (ParamRow("model", _OPT_ITEM_MODEL, _ITEM_MODEL),),
+    ),
+    FixRow(
+        "QTreeView",
+        "setModel",
+        (ParamRow("model", _OPT_ITEM_MODEL, _ITEM_MODEL),),
+    ),
+    FixRow(
+        "QMessageBox",
+        "aboutQt",
+        (
+            ParamRow("parent", _OPT_QWIDGET, "QWidget"),
+            ParamRow("title", "str", "str"),
+        ),
+        static=True,
+    ),
+    FixRow(
+        "QMessageBox",
+        "about",
+        (
+            ParamRow("parent", _OPT_QWIDGET, "QWidget"),
+            ParamRow("caption", "str", "str"),
+            ParamRow("text", "str", "str"),
+        ),
+        static=True,
+    ),
+    FixRow(
+        "QProgressDialog",
+        "setCancelButton",
+        (ParamRow("button", "typing.Optional[QPushButton]", "QPushButton"),),
+    ),
+)
+
+OVERLOADED_FIX_DATA: Final[Tuple[OverloadedFixRow, ...]] = ()
+
+ADD_ANNOTATION_FIX_DATA: Final[Tuple[AddAnnotationRow, ...]] = (
+    AddAnnotationRow(
+        "QTreeWidgetItem",
+        ('def __lt__(self, other: "QTreeWidgetItem") -> bool: ...',),
+    ),
+    AddAnnotationRow(
+        "QTableWidgetItem",
+        (
+            "def __eq__(self, other: object) -> bool: ...",
+            "def __ge__(self, other: object) -> bool: ...",
+            "def __gt__(self, other: object) -> bool: ...",
+            "def __le__(self, other: object) -> bool: ...",
+            "def __lt__(self, other: object) -> bool: ...",
+            "def __ne__(self, other: object) -> bool: ...",
+        ),
+    ),
+)
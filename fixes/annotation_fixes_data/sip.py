@@ -0,0 +1,17 @@
+"""Data rows of the annotation fixes for sip."""
+from typing import Final, Tuple
+
+from fixes.annotation_fixes_data import (
+    AddAnnotationRow,
+    FixRow,
+    OverloadedFixRow,
+    ParamRow,
+)
+
+ANNOTATION_FIX_DATA: Final[Tuple[FixRow, ...]] = (
+    FixRow("voidptr", "setwriteable", (ParamRow("bool", "bool", None),)),
+)
+
+OVERLOADED_FIX_DATA: Final[Tuple[OverloadedFixRow, ...]] = ()
+
+ADD_ANNOTATION_FIX_DATA: Final[Tuple[AddAnnotationRow, ...]] = ()
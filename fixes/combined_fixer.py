@@ -0,0 +1,63 @@
+"""Fixer that applies the SignalFixer and the CustomFixer in one pass."""
+from __future__ import annotations
+
+from libcst import (
+    BaseStatement,
+    ClassDef,
+    CSTTransformer,
+    FlattenSentinel,
+    FunctionDef,
+    RemovalSentinel,
+)
+
+from fixes.custom_fixer import CustomFixer
+from fixes.signal_fixer import SignalFixer
+
+
+class CombinedFixer(CSTTransformer):
+    """
+    Fixer that applies the SignalFixer and the CustomFixer in one pass.
+
+    Both fixers only replace whole methods. A method is offered to the
+    CustomFixer only if the SignalFixer left it unchanged, just like when
+    the CustomFixer visits the output of the SignalFixer.
+    """
+
+    def __init__(
+        self, signal_fixer: SignalFixer, custom_fixer: CustomFixer
+    ) -> None:
+        super().__init__()
+        self._signal_fixer = signal_fixer
+        self._custom_fixer = custom_fixer
+
+    def visit_ClassDef(self, node: ClassDef) -> bool:
+        """Put the class on the stacks of both fixers."""
+        self._signal_fixer.visit_ClassDef(node)
+        # The SignalFixer needs every class, so pruning by the CustomFixer
+        # is ignored.
+        self._custom_fixer.visit_ClassDef(node)
+        return True
+
+    def visit_FunctionDef(self, node: FunctionDef) -> bool:
+        """Skip the content of methods, the fixers replace methods as whole."""
+        return False
+
+    def leave_FunctionDef(
+        self, original_node: FunctionDef, updated_node: FunctionDef
+    ) -> BaseStatement | FlattenSentinel[BaseStatement] | RemovalSentinel:
+        """Let the SignalFixer and then the CustomFixer fix the method."""
+        fixed_node = self._signal_fixer.leave_FunctionDef(
+            original_node, updated_node
+        )
+        if fixed_node is not original_node:
+            return fixed_node
+        return self._custom_fixer.leave_FunctionDef(
+            original_node, updated_node
+        )
+
+    def leave_ClassDef(
+        self, original_node: ClassDef, updated_node: ClassDef
+    ) -> BaseStatement | FlattenSentinel[BaseStatement] | RemovalSentinel:
+        """Remove the class from the stacks of both fixers."""
+        self._signal_fixer.leave_ClassDef(original_node, updated_node)
+        return self._custom_fixer.leave_ClassDef(original_node, updated_node)
@@ -1,9 +1,8 @@
 """Fixer that applies custom fixes."""
 from __future__ import annotations
 
-import importlib.util
-from pathlib import Path
-from typing import List, Type
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional, Tuple, Type
 
 from libcst import (
     BaseStatement,
@@ -16,62 +15,62 @@ from libcst import (
 )
 
 from fixes.base_fix import FixBase
+from fixes.custom_fixes import ALL_FIXES
 
 
 class CustomFixer(CSTTransformer):
-    """Fixer that applies custom fixes."""
+    """
+    Fixer that applies custom fixes.
 
-    def __init__(self, mod_name: str):
-        super().__init__()
-        self._mod_name = mod_name
-        self._last_class: List[ClassDef] = []
+    The fixer holds no state of a module once it was visited, so one instance
+    is reused for all modules.
+    """
 
-        self._fixes: List[Type[FixBase]] = []
+    def __init__(self) -> None:
+        super().__init__()
+        # Names of the visited classes, the outermost class is first.
+        self._class_names: List[str] = []
 
-        for path in Path("fixes").joinpath("custom_fixes").glob("*.py"):
-            spec = importlib.util.spec_from_file_location(path.stem, path)
-            if spec is None or spec.loader is None:
-                print(f"Warning, import did not work from {path}")
-                continue
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
-            for obj in module.__dict__.values():
-                try:
-                    if issubclass(obj, FixBase) and obj is not FixBase:
-                        self._fixes.append(obj)
-                except TypeError:
-                    # If obj isn't a class
-                    continue
+        # Fixes by class (None for module level functions) and method name.
+        self._fixes_by_key: Dict[Tuple[Optional[str], str], Type[FixBase]] = {}
+        for fix in ALL_FIXES:
+            self._fixes_by_key.setdefault((fix.qt_class, fix.qt_method), fix)
+        # Classes (None for module level functions) that have any fixes.
+        self._fixed_classes: FrozenSet[Optional[str]] = frozenset(
+            qt_class for qt_class, _ in self._fixes_by_key
+        )
 
     def visit_ClassDef(self, node: ClassDef) -> bool:
         """Put a class on top of the stack when visiting."""
-        self._last_class.append(node)
-        return True
+        self._class_names.append(node.name.value)
+        # The fixes of a class apply to its nested classes as well, so only
+        # classes nested in a class with fixes need to be visited.
+        return self._class_names[0] in self._fixed_classes
 
     def leave_FunctionDef(
         self, original_node: FunctionDef, _: FunctionDef
     ) -> BaseStatement | FlattenSentinel[BaseStatement] | RemovalSentinel:
         """Leave the method and change signature if a signal."""
-        for fix in self._fixes:
-            try:
-                if (
-                    fix.qt_class == self._last_class[0].name.value
-                    and fix.qt_method == original_node.name.value
-                ):
-                    return self.create_fix(fix)
-            except IndexError:
-                if (
-                    fix.qt_class is None
-                    and fix.qt_method == original_node.name.value
-                ):
-                    return self.create_fix(fix)
+        class_name = self._class_names[0] if self._class_names else None
+        if class_name not in self._fixed_classes:
+            return original_node
+        fix = self._fixes_by_key.get((class_name, original_node.name.value))
+        if fix is not None:
+            # Classes are hashable, mypy does not see it for lru_cache.
+            return self.create_fix(fix)  # type: ignore[arg-type]
         return original_node
 
     @staticmethod
+    @lru_cache(maxsize=None)
     def create_fix(
         fix: Type[FixBase],
     ) -> BaseStatement | FlattenSentinel[BaseStatement] | RemovalSentinel:
-        """Creates a fix depending on the code to fix."""
+        """
+        Creates a fix depending on the code to fix.
+
+        The code of every fix is parsed only once; libcst nodes are immutable,
+        so the result can be reused for each match.
+        """
         if isinstance(fix.fixed_code, str):
             # If the fix is just one statement, replace it.
             return parse_statement(fix.fixed_code)
@@ -84,5 +83,5 @@ class CustomFixer(CSTTransformer):
         self, original_node: ClassDef, updated_node: ClassDef
     ) -> BaseStatement | FlattenSentinel[BaseStatement] | RemovalSentinel:
         """Remove a class from the stack and return the updated node."""
-        self._last_class.pop()
+        self._class_names.pop()
         return updated_node
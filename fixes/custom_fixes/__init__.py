@@ -0,0 +1,12 @@
+"""Custom fixes that are applied by the CustomFixer."""
+from typing import Tuple, Type
+
+from fixes.base_fix import FixBase
+from fixes.custom_fixes.pyqtslot import FixPyQtSlotDecorator
+from fixes.custom_fixes.voidptr_asarray_array import FixAsArrayVoidPtr
+
+# All custom fixes, new fixes have to be registered here.
+ALL_FIXES: Tuple[Type[FixBase], ...] = (
+    FixAsArrayVoidPtr,
+    FixPyQtSlotDecorator,
+)
@@ -1,14 +1,16 @@
 """Visitor that created AnnotationFixes from MypyFixes for a file."""
 from __future__ import annotations
 
+import hashlib
 import re
 from enum import IntEnum
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Dict, List, Sequence, Set, Tuple, cast
 
-from libcst import ClassDef, CSTVisitor, Decorator, FunctionDef, Name
+from libcst import ClassDef, CSTVisitor, Decorator, FunctionDef
 from libcst.metadata import PositionProvider
 from mypy import api as mypy_api
+from mypy.version import __version__ as mypy_version
 
 from fixes.annotation_fixes import (
     AddImportFix,
@@ -17,12 +19,125 @@ from fixes.annotation_fixes import (
     RemoveOverloadDecoratorFix,
 )
 
+REPO_DIR = Path(__file__).resolve().parent.parent
+
+# Options for checking the stub files. The cache lives in the repository, so
+# every run reuses it independent of the working directory.
+MYPY_OPTIONS = [
+    "--warn-unused-ignores",
+    "--incremental",
+    "--cache-dir",
+    str(REPO_DIR / ".mypy_cache"),
+]
+
+# Reports of earlier mypy runs, stored by the hash of the checked file.
+REPORT_CACHE_DIR = REPO_DIR / ".mypy_result_cache"
+
+
+def _report_cache_file(path: Path, cache_key: str) -> Path:
+    """
+    Return the file that caches the mypy report for the given file.
+
+    The name depends on the content of the file, the mypy version and
+    options and the given cache key, so a changed file or a version bump is
+    checked again.
+    """
+    digest = hashlib.sha256(path.read_bytes())
+    digest.update(f"{mypy_version}:{MYPY_OPTIONS}:{cache_key}".encode())
+    return REPORT_CACHE_DIR / f"{digest.hexdigest()}.txt"
+
+
+def _report_name(path: Path) -> str:
+    """Return the name of the resolved file for the reports."""
+    try:
+        return str(path.relative_to(REPO_DIR))
+    except ValueError:
+        return str(path)
+
+
+def run_mypy(
+    paths: Sequence[Path], cache_key: str | None = None
+) -> Dict[Path, str]:
+    """
+    Check all given files in a single mypy run.
+
+    Return the lines of the mypy report for every file, an empty report means
+    that mypy found no errors in the file. The lines name the files relative
+    to the repository (or by their absolute path if outside of it) instead of
+    the working directory. With a cache key (i.e. the version
+    of the checked package), reports of unchanged files are taken from the
+    cache and mypy only runs if any file is missing there.
+    """
+    if cache_key is None:
+        cache_files: Dict[Path, Path] = {}
+    else:
+        cache_files = {
+            path: _report_cache_file(path, cache_key) for path in paths
+        }
+    reports = {
+        path: cache_file.read_text(encoding="utf-8")
+        for path, cache_file in cache_files.items()
+        if cache_file.exists()
+    }
+    unchecked = [path for path in paths if path not in reports]
+    if not unchecked:
+        print(f"Using cached mypy reports for {len(paths)} files")
+        return reports
+
+    print(f"Running mypy on {len(unchecked)} files")
+    report, errors, status = mypy_api.run(
+        [*map(str, unchecked), *MYPY_OPTIONS]
+    )
+    # A blocking error or crash (status 2) reports nothing per file, so the
+    # empty reports must neither be used nor cached.
+    if status not in (0, 1):
+        raise RuntimeError(f"mypy failed with exit status {status}:\n{errors}")
+
+    # Group the lines by file name, mypy prints the names relative to the
+    # working directory.
+    lines_by_name: Dict[str, List[str]] = {}
+    for line in report.splitlines():
+        lines_by_name.setdefault(line.split(":", 1)[0], []).append(line)
+
+    paths_by_resolved = {path.resolve(): path for path in unchecked}
+    reports.update((path, "") for path in unchecked)
+    for name, lines in lines_by_name.items():
+        resolved = Path(name).resolve()
+        path = paths_by_resolved.get(resolved)
+        if path is not None:
+            report_name = _report_name(resolved)
+            reports[path] = "\n".join(
+                report_name + line[len(name) :] for line in lines
+            )
+
+    if cache_files:
+        REPORT_CACHE_DIR.mkdir(exist_ok=True)
+        for path in unchecked:
+            cache_files[path].write_text(reports[path], encoding="utf-8")
+    return reports
+
 
 class MypyVisitor(CSTVisitor):
     """Visitor that created AnnotationFixes from MypyFixes for a file."""
 
     METADATA_DEPENDENCIES = (PositionProvider,)
-    RE_NAME_NOT_DEFINED = re.compile(r'Name "(.+)" is not defined')
+    # Classifies a mypy error message. Every alternative is tried at the start
+    # of the message in the given order and is named after its ErrorType.
+    RE_ERROR_TYPE = re.compile(
+        r'(?P<MISSING_IMPORT>Name "(?P<name>.+)" is not defined)'
+        r'|(?P<STATIC_MISMATCH>Overload does not consistently use the "@staticmethod" decorator on all function signatures\.\Z)'
+        # Those errors are violations of the Liskov Principle and can only be
+        # ignored, since this is valid in Qt/C++.
+        r"|(?P<OVERRIDE>"
+        r"(?=.*Signature of)(?=.*incompatible with supertype)"
+        r"|(?=.* is incompatible with supertype )"
+        r"|(?=.* incompatible with return type )"
+        r"|(?=.*is incompatible with definition in base class))"
+        r"|(?P<SIGNATURE_MISMATCH>"
+        r"(?=.*Overloaded function signature)"
+        r"(?=.*will never be matched: signature)"
+        r"(?=.*parameter type\(s\) are the same or broader))"
+    )
 
     class ErrorType(IntEnum):
         """Type of fix that was detected by mypy."""
@@ -39,11 +154,12 @@ class MypyVisitor(CSTVisitor):
         # Imports from PyQt6 that are missing.
         MISSING_IMPORT = 4
 
-    def __init__(self, file: Path) -> None:
+    def __init__(self, file: Path, mypy_result: str | None = None) -> None:
         super().__init__()
         self._path = file
-        # collect all functions within a class
-        self._class_functions: List[FunctionDef] = []
+        # collect all functions within a class, by name and as a set
+        self._class_functions: Dict[str, List[FunctionDef]] = {}
+        self._class_function_set: Set[FunctionDef] = set()
         self.fixes: List[
             CommentFix | RemoveFix | RemoveOverloadDecoratorFix | AddImportFix
         ] = []
@@ -53,67 +169,55 @@ class MypyVisitor(CSTVisitor):
 
         self.last_class_method: Dict[str, FunctionDef] = {}
         self._last_class: List[ClassDef] = []
+        # The last method of every class on the stack, if any yet.
+        self._last_method: List[FunctionDef | None] = []
 
-        self._parse_mypy_result()
+        if mypy_result is None:
+            mypy_result = run_mypy([file])[file]
+        self._parse_mypy_result(mypy_result)
         if self._missing_imports:
             self._add_fix_for_missing_imports()
 
-    def _parse_mypy_result(self) -> None:
+    def _parse_mypy_result(self, mypy_result: str) -> None:
         """Parse the results from a mypy run on the file."""
-        print(f"Running mypy on file {self._path}")
-        mypy_result = mypy_api.run([str(self._path), "--warn-unused-ignores"])[
-            0
-        ]
-
-        if mypy_result.startswith("Success"):
+        if not mypy_result:
             print(f"Mypy did not detect any errors for file {self._path}")
             return
 
-        for line in mypy_result.split("\n"):
+        # Bind the methods used for every line once.
+        parse_line = self._parse_line
+        match_error_type = self.RE_ERROR_TYPE.match
+        add_missing_import = self._missing_imports.append
+        add_error_type = self._add_error_type
+        error_types = MypyVisitor.ErrorType
+
+        for line in mypy_result.splitlines():
             try:
-                line_nbr, error_msg = self._parse_line(line)
+                line_nbr, error_msg = parse_line(line)
             except IndexError:
                 continue
 
-            match = self.RE_NAME_NOT_DEFINED.match(error_msg)
-            if match:
-                self._missing_imports.append(match.group(1))
-            elif error_msg == (
-                'Overload does not consistently use the "@staticmethod" '
-                "decorator on all function signatures."
-            ):
-                self._add_error_type(
-                    line_nbr, MypyVisitor.ErrorType.STATIC_MISMATCH
-                )
-            elif (
-                (
-                    "Signature of" in error_msg
-                    and "incompatible with supertype" in error_msg
-                )
-                or (
-                    " is incompatible with supertype " in error_msg
-                    or " incompatible with return type " in error_msg
-                )
-                or (
-                    "is incompatible with definition in base class"
-                    in error_msg
-                )
-            ):
-                # Those errors are violations of the Liskov Principle and can
-                # only be ignored, since this is valid in Qt/C++.
-                self._add_error_type(line_nbr, MypyVisitor.ErrorType.OVERRIDE)
-            elif (
-                "Overloaded function signature" in error_msg
-                and "will never be matched: signature" in error_msg
-                and "parameter type(s) are the same or broader" in error_msg
-            ):
-                self._add_error_type(
-                    line_nbr, MypyVisitor.ErrorType.SIGNATURE_MISMATCH
-                )
-            else:
+            match = match_error_type(error_msg)
+            if match is None:
                 print(
                     f"WARNING: Could not fix error in line {line_nbr}: {error_msg}"
                 )
+            elif match.lastgroup == "MISSING_IMPORT":
+                add_missing_import(match.group("name"))
+            else:
+                add_error_type(
+                    line_nbr, error_types[cast(str, match.lastgroup)]
+                )
+
+    @property
+    def no_errors(self) -> bool:
+        """
+        Return if mypy reported no errors that are bound to nodes.
+
+        The visitor does not need any positions then, so it can visit the
+        module without resolving metadata.
+        """
+        return not self._errors
 
     def _add_fix_for_missing_imports(self) -> None:
         """Add a fix for missing imports."""
@@ -153,14 +257,20 @@ class MypyVisitor(CSTVisitor):
             )
             raise
 
-        # Extract the error message:
-        error_msg = line.split("error: ")[1]
-        # If error is not in line (i.e. for notes), an IndexError is raised
-        return line_nbr, error_msg
+        # Extract the error message. If error is not in line (i.e. for notes),
+        # an IndexError is raised.
+        start = line.find("error: ")
+        if start == -1:
+            raise IndexError(f"No error in line: {line}")
+        return line_nbr, line[start + len("error: ") :]
 
     def visit_FunctionDef(self, node: "FunctionDef") -> bool | None:
         """Visit a FunctionDef to co"""
-        self._class_functions.append(node)
+        self._class_functions.setdefault(node.name.value, []).append(node)
+        self._class_function_set.add(node)
+        # Only methods of classes are remembered.
+        if self._last_method:
+            self._last_method[-1] = node
         return False
 
     def leave_FunctionDef(self, original_node: FunctionDef) -> None:
@@ -171,23 +281,17 @@ class MypyVisitor(CSTVisitor):
             self.fixes.append(fix)
         except ValueError:
             pass
-        try:
-            self.last_class_method[
-                self._last_class[-1].name.value
-            ] = original_node
-        except IndexError:
-            # If not in a class, skip.
-            pass
 
     def visit_ClassDef(self, node: ClassDef) -> bool:
         """Put a class on top of the stack when visiting."""
         self._last_class.append(node)
+        self._last_method.append(None)
 
         # Check if class needs to be fixed
-        line = self.get_metadata(PositionProvider, node).start.line
-        if line in self._errors:
+        error_type = self._error_type(node)
+        if error_type is not None:
             # Currently, only override comment is supported for classes.
-            assert self._errors[line] == MypyVisitor.ErrorType.OVERRIDE
+            assert error_type == MypyVisitor.ErrorType.OVERRIDE
             print(f"Adding override comment to class: {node.name.value}")
             self.fixes.append(CommentFix(node, "# type: ignore[misc]"))
 
@@ -199,14 +303,13 @@ class MypyVisitor(CSTVisitor):
         for fix in self.fixes:
             if (
                 isinstance(fix, RemoveFix)
-                and fix.node in self._class_functions
+                and isinstance(fix.node, FunctionDef)
+                and fix.node in self._class_function_set
             ):
                 remaining_functions = [
                     function
-                    for function in self._class_functions
-                    if isinstance(fix.node, FunctionDef)
-                    and function.name.value == fix.node.name.value
-                    and fix.node is not function
+                    for function in self._class_functions[fix.node.name.value]
+                    if fix.node is not function
                 ]
                 if len(remaining_functions) == 1:
                     for decorator in remaining_functions[0].decorators:
@@ -215,17 +318,23 @@ class MypyVisitor(CSTVisitor):
                                 RemoveOverloadDecoratorFix(decorator)
                             )
         self._class_functions.clear()
+        self._class_function_set.clear()
         self._last_class.pop()
+        last_method = self._last_method.pop()
+        if last_method is not None:
+            self.last_class_method[original_node.name.value] = last_method
 
     @staticmethod
     def _is_overload_decorator(decorator: Decorator) -> bool:
         """Check if a Decorator is an overload decorator."""
+        # Compare the names directly, a matcher is much slower. Only a Name
+        # has a str value, so an Attribute of a Name is checked implicitly.
+        expression = decorator.decorator
         return (
-            len(decorator.decorator.children) >= 3
-            and isinstance(decorator.decorator.children[0], Name)
-            and isinstance(decorator.decorator.children[2], Name)
-            and decorator.decorator.children[0].value == "typing"
-            and decorator.decorator.children[2].value == "overload"
+            getattr(getattr(expression, "attr", None), "value", None)
+            == "overload"
+            and getattr(getattr(expression, "value", None), "value", None)
+            == "typing"
         )
 
     @staticmethod
@@ -241,20 +350,24 @@ class MypyVisitor(CSTVisitor):
             return CommentFix(node, "# type: ignore[misc]")
         raise ValueError(f"Could not detect fix type: {fix_type}")
 
+    def _error_type(
+        self, node: ClassDef | FunctionDef | Decorator
+    ) -> MypyVisitor.ErrorType | None:
+        """Return the type of the error in the first line of the node."""
+        if not self._errors:
+            # Without any errors the position of the node is not needed.
+            return None
+        line = self.get_metadata(PositionProvider, node).start.line
+        return self._errors.get(line)
+
     def _get_fix_for_function(
         self, function: FunctionDef
     ) -> CommentFix | RemoveFix:
         for decorator in function.decorators:
-            try:
-                error_type = self._errors[
-                    self.get_metadata(PositionProvider, decorator).start.line
-                ]
-            except KeyError:
-                continue
-            return self._generate_fix(decorator, error_type)
-        pos = self.get_metadata(PositionProvider, function).start.line
-        try:
-            error_type = self._errors[pos]
-        except KeyError as exc:
-            raise ValueError("No fix available for function") from exc
+            error_type = self._error_type(decorator)
+            if error_type is not None:
+                return self._generate_fix(decorator, error_type)
+        error_type = self._error_type(function)
+        if error_type is None:
+            raise ValueError("No fix available for function")
         return self._generate_fix(function, error_type)
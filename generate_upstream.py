@@ -1,63 +1,142 @@
 """Generate the upstream stubs."""
-import re
+import hashlib
+import os
+import pickle
 import shutil
 import subprocess
 import sys
 import tempfile
 import zipfile
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import lru_cache, partial
+from importlib import metadata
 from pathlib import Path
-from typing import List, Set, Tuple
+from typing import Dict, List, Optional, Set, Tuple
 
-from libcst import MetadataWrapper, parse_module
+import black
+import isort
+from libcst import MetadataWrapper, Module, parse_module
 from mypy.stubgen import Options, generate_stubs
 
 from fixes.annotation_fixer import AnnotationFixer
+from fixes.combined_fixer import CombinedFixer
 from fixes.custom_fixer import CustomFixer
-from fixes.mypy_visitor import MypyVisitor
+from fixes.mypy_visitor import MypyVisitor, run_mypy
 from fixes.signal_fixer import SignalFixer
 from version import PYQT_VERSION
 
 SRC_DIR = Path(__file__).parent.joinpath("PyQt6-stubs")
 
+# Parsed stub modules of earlier runs, stored by the hash of the source and
+# the libcst version, since the pickled nodes depend on it.
+AST_CACHE_DIR = Path(__file__).parent / ".stub_ast_cache"
+LIBCST_VERSION = metadata.version("libcst")
 
-RE_NAME_NOT_DEFINED = re.compile(r'Name "(.+)" is not defined')
+# Fixed stubs of earlier runs, stored by the signature of their inputs.
+RESULT_CACHE_DIR = Path(__file__).parent / ".stub_pipeline_cache"
 
-IMPORT_FIXED: Set[Tuple[str, str]] = set()
+# Downloaded PyQt6 wheels, by version.
+WHEEL_CACHE_DIR = (
+    Path.home()
+    / ".cache"
+    / "pyqt6-stubs-wheels"
+    / ".".join(str(nbr) for nbr in PYQT_VERSION)
+)
+
+# Settings for formatting the stubs with iSort and Black.
+ISORT_CONFIG = isort.Config(profile="black", line_length=10000)
+BLACK_MODE = black.Mode(line_length=10000)
+BLACK_PYI_MODE = black.Mode(line_length=10000, is_pyi=True)
+
+# The CustomFixer keeps no state between modules, so it is shared.
+CUSTOM_FIXER = CustomFixer()
+
+
+def extract_wheel(
+    wheel: Path, temp_folder: Path, file_filter: List[str]
+) -> List[Path]:
+    """
+    Extract the files needed for the stubs from a downloaded wheel.
+
+    The top level pyi files that pass the filter are written straight to
+    the PyQt6-stubs folder. The uic sources, from which add_uic_stubs
+    generates the uic stubs, go to the temporary folder together with the
+    __init__.py of PyQt6, so stubgen names them as modules of the PyQt6
+    package. Everything else, mostly binaries, stays in the archive.
+
+    Return the stub files that were written.
+    """
+    print(f"Extracting file {wheel}")
+    stub_files: List[Path] = []
+    with zipfile.ZipFile(wheel, "r") as zip_ref:
+        for info in zip_ref.infolist():
+            path = Path(info.filename)
+            if path.suffix == ".pyi" and len(path.parts) == 2:
+                if file_filter and path.stem not in file_filter:
+                    print(f"Skipping file: {path}")
+                    continue
+                stub_file = SRC_DIR / path.name
+                with zip_ref.open(info) as src, stub_file.open("wb") as dst:
+                    shutil.copyfileobj(src, dst, 1 << 20)
+                stub_files.append(stub_file)
+            elif path.parts == ("PyQt6", "__init__.py") or (
+                path.suffix == ".py" and path.parts[:2] == ("PyQt6", "uic")
+            ):
+                # Wheels are extracted in parallel into the same folder,
+                # create the shared parent folders up front.
+                parent = temp_folder.joinpath(path).parent
+                parent.mkdir(parents=True, exist_ok=True)
+                zip_ref.extract(info, temp_folder)
+    return stub_files
 
 
 def download_stubs(download_folder: Path, file_filter: List[str]) -> None:
-    """Download the stubs and copy them to PyQt6-stubs folder."""
-    subprocess.check_call(
-        [
-            sys.executable,
-            "-m",
-            "pip",
-            "download",
-            "-d",
-            str(download_folder),
-            f"PyQt6=={'.'.join((str(nbr) for nbr in PYQT_VERSION))}",
-        ]
-    )
+    """
+    Download the stubs and copy them to PyQt6-stubs folder.
+
+    Wheels from earlier runs in the download folder are reused. The wheels
+    are only downloaded if pip cannot resolve PyQt6 and all its dependencies
+    from the folder alone.
+    """
+    pip_download = [
+        sys.executable,
+        "-m",
+        "pip",
+        "download",
+        "-d",
+        str(download_folder),
+        f"PyQt6=={'.'.join((str(nbr) for nbr in PYQT_VERSION))}",
+    ]
+    try:
+        subprocess.check_call(
+            [*pip_download, "--no-index", "--find-links", str(download_folder)]
+        )
+    except subprocess.CalledProcessError:
+        # The folder is empty or incomplete, i.e. an earlier run was
+        # interrupted. Wheels that are already there are not downloaded again.
+        print(f"Downloading missing wheels to {download_folder}")
+        subprocess.check_call(pip_download)
 
     # Extract the upstream pyi files
     with tempfile.TemporaryDirectory() as temp_folder_str:
         temp_folder = Path(temp_folder_str)
         print(f"Created temporary directory {temp_folder}")
-        for download in download_folder.glob("*.whl"):
-            print(f"Extracting file {download}")
-            with zipfile.ZipFile(download, "r") as zip_ref:
-                zip_ref.extractall(temp_folder)
-
-        # Take every pyi file from all folders and move it to "PyQt6-stubs"
-        for folder in temp_folder.glob("*"):
-            print(f"Scanning folder for pyi files {folder}")
-            for extracted_file in folder.glob("*.pyi"):
-                if file_filter and extracted_file.stem not in file_filter:
-                    print(f"Skipping file: {extracted_file}")
-                    continue
-                copy_file = SRC_DIR / extracted_file.name
-                shutil.copyfile(extracted_file, copy_file)
-                subprocess.check_call(["git", "add", str(copy_file)])
+        with ThreadPoolExecutor() as executor:
+            stub_files = [
+                str(stub_file)
+                for wheel_stubs in executor.map(
+                    partial(
+                        extract_wheel,
+                        temp_folder=temp_folder,
+                        file_filter=file_filter,
+                    ),
+                    download_folder.glob("*.whl"),
+                )
+                for stub_file in wheel_stubs
+            ]
+        # Add all stub files in one call.
+        if stub_files:
+            subprocess.check_call(["git", "add", "--", *stub_files])
 
         add_uic_stubs(temp_folder)
 
@@ -91,66 +170,253 @@ def add_uic_stubs(temp_folder: Path) -> None:
             export_less=False,
         )
         generate_stubs(options)
+        # Check the generated stubs before the existing ones are removed.
+        generated_path = Path(gen_stub_temp_folder) / "PyQt6" / "uic"
+        if not any(generated_path.rglob("*.pyi")):
+            raise FileNotFoundError(
+                f"No uic stubs were generated in {generated_path}"
+            )
         uic_path = SRC_DIR / "uic"
         shutil.rmtree(uic_path)
-        shutil.copytree(Path(gen_stub_temp_folder) / "PyQt6" / "uic", uic_path)
+        shutil.copytree(generated_path, uic_path)
 
 
-if __name__ == "__main__":
-    for arg in sys.argv[1:]:
-        print(f"Adding file to process list: {arg}")
-    files = sys.argv[1:]
+def write_file(file: Path, data: bytes) -> None:
+    """
+    Write the data to the file in one call and replace the file atomically.
+
+    Neither the stubs nor the cache files are ever left half written.
+    """
+    temp_file = file.with_name(f"{file.name}.{os.getpid()}.tmp")
+    with temp_file.open("wb", buffering=0) as fhandle:
+        fhandle.write(data)
+    os.replace(temp_file, file)
+
+
+def ast_cache_file(source: bytes) -> Path:
+    """Return the file of the parsed module in the AST cache."""
+    digest = hashlib.sha256(source).hexdigest()
+    return AST_CACHE_DIR / f"{digest}-{LIBCST_VERSION}.pkl"
 
-    # Create PyQt6-stubs folder if necessary
-    SRC_DIR.mkdir(exist_ok=True)
 
-    # Update pip just in case
-    subprocess.check_call(
-        [sys.executable, "-m", "pip", "install", "--upgrade", "pip"]
+def parse_stub(source: bytes) -> Tuple[Module, bool]:
+    """
+    Parse the source of a stub file, using the cache of parsed modules.
+
+    Return the module and if it was taken from the cache.
+    """
+    cache_file = ast_cache_file(source)
+    if cache_file.exists():
+        with cache_file.open("rb") as fhandle:
+            return pickle.load(fhandle), True
+
+    module = parse_module(source)
+    AST_CACHE_DIR.mkdir(exist_ok=True)
+    write_file(
+        cache_file, pickle.dumps(module, protocol=pickle.HIGHEST_PROTOCOL)
     )
+    return module, False
 
-    # Download required packages
-    with tempfile.TemporaryDirectory() as temp_dwld_folder:
-        download_stubs(Path(temp_dwld_folder), files)
 
-    # Now apply the fixes:
-    for file in SRC_DIR.glob("*.pyi"):
-        if file.stem.startswith("__") or files and file.stem not in files:
-            print(f"Ignoring file {file}")
-            continue
+@lru_cache(maxsize=None)
+def fixers_digest() -> str:
+    """
+    Return a hash of the code of all fixers and of this script.
+
+    The versions of PyQt6, libcst and of the formatters are included, since
+    they change the output as well. The SignalFixer inspects the installed
+    PyQt6, which may differ from the version of the stubs.
+    """
+    installed_pyqt: Optional[str]
+    try:
+        from PyQt6 import QtCore
+    except ModuleNotFoundError:
+        installed_pyqt = None
+    else:
+        installed_pyqt = QtCore.PYQT_VERSION_STR
+    versions = (
+        PYQT_VERSION,
+        installed_pyqt,
+        LIBCST_VERSION,
+        black.__version__,
+        isort.__version__,
+    )
+    digest = hashlib.sha256(str(versions).encode())
+    fixer_files = sorted(Path(__file__).parent.joinpath("fixes").rglob("*.py"))
+    for path in [*fixer_files, Path(__file__)]:
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def result_cache_file(source: bytes, mypy_result: str) -> Path:
+    """Return the file of the fixed stub in the result cache."""
+    digest = hashlib.sha256(source)
+    digest.update(mypy_result.encode())
+    digest.update(fixers_digest().encode())
+    return RESULT_CACHE_DIR / f"{digest.hexdigest()}.pyi"
+
+
+def process_stub(file: Path, mypy_result: str) -> Tuple[bool, bool]:
+    """
+    Apply all fixes to the given stub file, using its mypy report.
+
+    The result only depends on the source, the mypy report and the fixers. If
+    the same inputs were fixed before, the stored result is used instead.
+
+    Return if the fixed stub and if the parsed stub were taken from their
+    caches.
+    """
+    # libcst detects the encoding of the source and writes it back in the
+    # same encoding, so the file is read and written as bytes.
+    source = file.read_bytes()
+    result_file = result_cache_file(source, mypy_result)
+    if result_file.exists():
+        code = result_file.read_bytes()
+        if code != source:
+            write_file(file, code)
+        return True, False
 
-        # # Run mypy and find errors to fix.
-        # mypy_fixes = fix_annotation_for_file(file)
+    try:
+        signal_fixer = SignalFixer(file.stem)
+    except ModuleNotFoundError:
+        # Stubs of modules that are not installed are left untouched.
+        print(f"Could not import module {file.stem}")
+        return False, False
 
-        with file.open("r", encoding="utf-8") as fhandle:
-            stub_tree = MetadataWrapper(parse_module(fhandle.read()))
+    stub_tree, parsed_cached = parse_stub(source)
 
-        # Create AnnotationFixes from the MypyFixes.
-        fix_creator = MypyVisitor(file)
+    # Create AnnotationFixes from the MypyFixes. Only the MypyVisitor needs
+    # positions and only if mypy reported errors. The wrapper must not copy
+    # the module, the fixes refer to its nodes.
+    fix_creator = MypyVisitor(file, mypy_result)
+    if fix_creator.no_errors:
         stub_tree.visit(fix_creator)
+    else:
+        MetadataWrapper(stub_tree, unsafe_skip_copy=True).visit(fix_creator)
 
-        annotation_fixer = AnnotationFixer(
-            file.stem, fix_creator.fixes, fix_creator.last_class_method
-        )
-        modified_tree = stub_tree.visit(annotation_fixer)
-        try:
-            signal_fixer = SignalFixer(file.stem)
-        except ModuleNotFoundError:
-            print(f"Could not import module {file.stem}")
+    annotation_fixer = AnnotationFixer(
+        file.stem, fix_creator.fixes, fix_creator.last_class_method
+    )
+    modified_tree = stub_tree.visit(annotation_fixer)
+    # The signals and custom fixes are applied in a single pass.
+    modified_tree = modified_tree.visit(
+        CombinedFixer(signal_fixer, CUSTOM_FIXER)
+    )
+
+    # Format the code while it is in memory. Leave files that need no
+    # changes untouched.
+    code = format_code(modified_tree.code, is_pyi=True).encode(
+        modified_tree.encoding
+    )
+    if code != source:
+        write_file(file, code)
+    RESULT_CACHE_DIR.mkdir(exist_ok=True)
+    write_file(result_file, code)
+    return False, parsed_cached
+
+
+def prune_cache(cache_dir: Path, keep: Set[Path]) -> None:
+    """Remove all entries of the cache folder that are not kept."""
+    if not cache_dir.is_dir():
+        return
+    for path in cache_dir.iterdir():
+        if path in keep:
             continue
-        modified_tree = modified_tree.visit(signal_fixer)
-        custom_fixer = CustomFixer(file.stem)
-        modified_tree = modified_tree.visit(custom_fixer)
+        if path.is_dir():
+            shutil.rmtree(path)
+        else:
+            path.unlink()
 
-        with file.open("w", encoding="utf-8") as fhandle:
-            fhandle.write(modified_tree.code)
 
-    # Lint the files with iSort and Black
-    print("Fixing files with iSort")
-    subprocess.check_call(
-        ["isort", "--profile", "black", "-l 10000", str(SRC_DIR)]
+def format_code(code: str, is_pyi: bool) -> str:
+    """Sort the imports of the code with iSort and format it with Black."""
+    code = isort.code(
+        code, extension="pyi" if is_pyi else "py", config=ISORT_CONFIG
     )
-    print("Fixing files with Black")
-    subprocess.check_call(
-        ["black", "--safe", "--quiet", "-l 10000", str(SRC_DIR)]
+    try:
+        # Black keeps checking that the formatted code is equivalent (--safe).
+        return black.format_file_contents(
+            code, fast=False, mode=BLACK_PYI_MODE if is_pyi else BLACK_MODE
+        )
+    except black.NothingChanged:
+        return code
+
+
+def format_stub(file: Path) -> None:
+    """Format a file that was not fixed, like the generated uic stubs."""
+    code = file.read_text(encoding="utf-8")
+    formatted_code = format_code(code, is_pyi=file.suffix == ".pyi")
+    if formatted_code != code:
+        write_file(file, formatted_code.encode("utf-8"))
+
+
+if __name__ == "__main__":
+    for arg in sys.argv[1:]:
+        print(f"Adding file to process list: {arg}")
+    files = sys.argv[1:]
+
+    # Create PyQt6-stubs folder if necessary
+    SRC_DIR.mkdir(exist_ok=True)
+
+    # Download required packages, the wheels are kept for later runs.
+    WHEEL_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    prune_cache(WHEEL_CACHE_DIR.parent, {WHEEL_CACHE_DIR})
+    download_stubs(WHEEL_CACHE_DIR, files)
+
+    # Now apply the fixes, every stub file in a worker process:
+    # The directory entries provide the sizes without another lookup by path.
+    stub_sizes: Dict[Path, int] = {}
+    with os.scandir(SRC_DIR) as entries:
+        for entry in entries:
+            file = Path(entry.path)
+            if file.suffix != ".pyi" or not entry.is_file():
+                continue
+            if file.stem.startswith("__") or files and file.stem not in files:
+                print(f"Ignoring file {file}")
+                continue
+            stub_sizes[file] = entry.stat().st_size
+    # Start with the largest files, so they do not hold up the end of the run.
+    stub_files = sorted(stub_sizes, key=stub_sizes.__getitem__, reverse=True)
+    # Check all stub files in a single mypy run.
+    mypy_results = run_mypy(stub_files, cache_key=str(PYQT_VERSION))
+    if not files:
+        # Drop the cached stubs that no stub of this run can use. A partial
+        # run keeps them, they belong to the other stubs as well.
+        sources = {file: file.read_bytes() for file in stub_files}
+        prune_cache(
+            AST_CACHE_DIR, {ast_cache_file(src) for src in sources.values()}
+        )
+        prune_cache(
+            RESULT_CACHE_DIR,
+            {
+                result_cache_file(source, mypy_results[file])
+                for file, source in sources.items()
+            },
+        )
+    with ProcessPoolExecutor() as executor:
+        cache_hits = list(
+            executor.map(
+                process_stub,
+                stub_files,
+                [mypy_results[file] for file in stub_files],
+                chunksize=1,
+            )
+        )
+    fixed_hits = sum(fixed for fixed, _ in cache_hits)
+    parsed_hits = sum(parsed for _, parsed in cache_hits)
+    print(
+        f"Fixed stubs taken from cache: {fixed_hits} of {len(stub_files)}, "
+        f"parsed stubs taken from cache: {parsed_hits} of "
+        f"{len(stub_files) - fixed_hits}"
     )
+
+    # The fixed stubs are already formatted. Lint the other files with iSort
+    # and Black, every file in a worker process.
+    print("Fixing remaining files with iSort and Black")
+    other_files = [
+        file
+        for file in [*SRC_DIR.rglob("*.py"), *SRC_DIR.rglob("*.pyi")]
+        if file not in stub_sizes
+    ]
+    with ProcessPoolExecutor() as executor:
+        list(executor.map(format_stub, other_files))
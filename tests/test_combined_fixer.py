@@ -0,0 +1,86 @@
+import pytest
+from libcst import parse_module
+
+import fixes.custom_fixer
+from fixes.base_fix import FixBase
+from fixes.combined_fixer import CombinedFixer
+from fixes.custom_fixer import CustomFixer
+from fixes.custom_fixes import ALL_FIXES
+from fixes.signal_fixer import SignalFixer
+
+STUB = """\
+import typing
+
+class QObject:
+
+    def objectNameChanged(self, objectName: str) -> None: ...
+    @typing.overload
+    def destroyed(self) -> None: ...
+    @typing.overload
+    def destroyed(self, object: typing.Optional["QObject"]) -> None: ...
+    def setObjectName(self, name: str) -> None: ...
+    def deleteLater(self) -> None: ...
+
+    class Nested:
+        def destroyed(self) -> None: ...
+        def setObjectName(self, name: str) -> None: ...
+
+    def objectName(self) -> str: ...
+
+class QTimer(QObject):
+    def timeout(self) -> None: ...
+    def setObjectName(self, name: str) -> None: ...
+
+def pyqtSlot(*types) -> None: ...
+"""
+
+
+class FixDestroyed(FixBase):
+    """Custom fix of a method that is a signal as well."""
+
+    qt_module = "QtCore"
+    qt_class = "QObject"
+    qt_method = "destroyed"
+
+    fixed_code = "def destroyed(self, *args: typing.Any) -> None: ..."
+
+
+class FixSetObjectName(FixBase):
+    """Custom fix of a method that is not a signal."""
+
+    qt_module = "QtCore"
+    qt_class = "QObject"
+    qt_method = "setObjectName"
+
+    fixed_code = [
+        "@typing.overload\ndef setObjectName(self, name: str) -> None: ...",
+        "@typing.overload\ndef setObjectName(self, name: bytes) -> None: ...",
+    ]
+
+
+@pytest.fixture
+def custom_fixer(monkeypatch: pytest.MonkeyPatch) -> CustomFixer:
+    """CustomFixer with additional fixes for signals and nested classes."""
+    monkeypatch.setattr(
+        fixes.custom_fixer,
+        "ALL_FIXES",
+        (*ALL_FIXES, FixDestroyed, FixSetObjectName),
+    )
+    return CustomFixer()
+
+
+def test_same_code_as_separate_fixers(custom_fixer: CustomFixer) -> None:
+    """The combined fixer creates the code of both fixers run in turn."""
+    separate = parse_module(STUB).visit(SignalFixer("QtCore"))
+    separate = separate.visit(custom_fixer)
+    combined = parse_module(STUB).visit(
+        CombinedFixer(SignalFixer("QtCore"), custom_fixer)
+    )
+
+    assert combined.code == separate.code
+    # Both fixers changed something, the outer destroyed is a signal.
+    assert "destroyed: typing.ClassVar[pyqtSignal]" in combined.code
+    assert "timeout: typing.ClassVar[pyqtSignal]" in combined.code
+    assert "def destroyed(self, *args: typing.Any)" in combined.code
+    assert combined.code.count("name: bytes") == 2
+    assert "def pyqtSlot(*types: typing.Any)" in combined.code
@@ -0,0 +1,119 @@
+from pathlib import Path
+from typing import Dict, Optional
+
+import pytest
+
+from fixes.mypy_visitor import MypyVisitor, run_mypy
+
+
+@pytest.fixture
+def stub_files(tmp_path: Path) -> Dict[str, Path]:
+    """Stub files with two errors, with one error and without errors."""
+    sources = {
+        "two_errors": 'a: int = "a"\nb: str = 1\n',
+        "one_error": (
+            "class A:\n"
+            "    def f(self) -> int: ...\n"
+            "class B(A):\n"
+            "    def f(self) -> str: ...\n"
+        ),
+        "no_errors": "d: int = 1\n",
+    }
+    files = {}
+    for name, source in sources.items():
+        files[name] = tmp_path / f"{name}.pyi"
+        files[name].write_text(source, encoding="utf-8")
+    return files
+
+
+def test_lines_grouped_per_file(stub_files: Dict[str, Path]) -> None:
+    """Every file gets the lines of mypy's report that belong to it."""
+    reports = run_mypy(list(stub_files.values()))
+
+    assert reports.keys() == set(stub_files.values())
+    for name, line_nbrs in (("two_errors", ["1", "2"]), ("one_error", ["4"])):
+        file = stub_files[name]
+        lines = reports[file].splitlines()
+        assert [line.split(":")[1] for line in lines] == line_nbrs
+        assert all(line.startswith(f"{file.resolve()}:") for line in lines)
+
+
+def test_file_without_errors(stub_files: Dict[str, Path]) -> None:
+    """A file without errors gets an empty report."""
+    reports = run_mypy(list(stub_files.values()))
+
+    assert reports[stub_files["no_errors"]] == ""
+    assert MypyVisitor(stub_files["no_errors"], "").no_errors
+    assert not MypyVisitor(
+        stub_files["one_error"], reports[stub_files["one_error"]]
+    ).no_errors
+
+
+def test_blocking_error(stub_files: Dict[str, Path]) -> None:
+    """A blocking error raises instead of reporting no errors."""
+    broken = stub_files["no_errors"].with_name("broken.pyi")
+    broken.write_text("def f(:\n", encoding="utf-8")
+
+    with pytest.raises(RuntimeError, match="exit status 2"):
+        run_mypy([broken, *stub_files.values()])
+
+
+def test_paths_relative_to_other_cwd(
+    stub_files: Dict[str, Path],
+    tmp_path: Path,
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    """Paths relative to another working directory are reported the same."""
+    reports = run_mypy(list(stub_files.values()))
+    work_dir = tmp_path / "work"
+    work_dir.mkdir()
+    monkeypatch.chdir(work_dir)
+    relative_files = [Path("..", file.name) for file in stub_files.values()]
+
+    relative_reports = run_mypy(relative_files)
+
+    assert relative_reports == {
+        relative_file: reports[file]
+        for relative_file, file in zip(relative_files, stub_files.values())
+    }
+
+
+@pytest.mark.parametrize(
+    "message, error_type",
+    [
+        ('Unused "type: ignore" comment', None),
+        (
+            'Overload does not consistently use the "@staticmethod" '
+            "decorator on all function signatures.",
+            "STATIC_MISMATCH",
+        ),
+        ('Name "QtGui" is not defined', "MISSING_IMPORT"),
+        ('Signature of "f" incompatible with supertype "A"', "OVERRIDE"),
+        (
+            'Argument 1 of "f" is incompatible with supertype "A"; supertype '
+            'defines the argument type as "int"',
+            "OVERRIDE",
+        ),
+        (
+            'Return type "str" of "g" incompatible with return type "int" in '
+            'supertype "A"',
+            "OVERRIDE",
+        ),
+        (
+            'Definition of "x" in base class "A" is incompatible with '
+            'definition in base class "M"',
+            "OVERRIDE",
+        ),
+        (
+            "Overloaded function signature 2 will never be matched: "
+            "signature 1's parameter type(s) are the same or broader",
+            "SIGNATURE_MISMATCH",
+        ),
+        ("Function is missing a type annotation", None),
+    ],
+)
+def test_error_type(message: str, error_type: Optional[str]) -> None:
+    """The messages of mypy 0.942 are classified by their fix."""
+    match = MypyVisitor.RE_ERROR_TYPE.match(message)
+
+    assert (match and match.lastgroup) == error_type